@@ -7,8 +7,19 @@ import pathlib
 import datetime
 import sqlite3
 import asyncio
+import ctypes
+import queue
+import bisect
+import threading
+import io
+import cProfile
+import pstats
+import tracemalloc
+import json
+import math
 
 from threading import Thread
+from collections import OrderedDict, deque
 
 from PySide6 import QtWidgets, QtGui, QtCore
 from PySide6.QtCore import Signal
@@ -30,11 +41,217 @@ else:
     # If the application is not frozen (development)
     BASE_DIR = pathlib.Path(__file__).resolve().parent
 
+# Memory budget (in bytes) for the item payloads kept in the item cache
+ITEM_CACHE_BUDGET = 4 * 1024 * 1024
+
+# Maximum number of items kept in the item cache (metadata included)
+ITEM_CACHE_SIZE = 5000
+
+# Maximum number of characters shown on a card
+PREVIEW_LENGTH = 500
+
+# Interval (in ms) between two metrics reports
+METRICS_REPORT_INTERVAL = 60000
+
+# Age (in days) after which the items are moved into the archive database
+ARCHIVE_AFTER_DAYS = 2
+
+# Number of items moved per archiving batch, pause (in seconds) between two batches and interval (in seconds) between two checks
+ARCHIVE_BATCH_SIZE = 50
+ARCHIVE_BATCH_PAUSE = 0.5
+ARCHIVE_INTERVAL = 300
+
+# Number of archived items loaded by the "show older" button
+ARCHIVE_PAGE_SIZE = 50
+
+# Number of items loaded per page when scrolling to the end or switching the type filter
+PAGE_SIZE = 50
+
+# Distance (in px) from the end of the scroll area at which the next page is loaded
+PAGE_THRESHOLD = 400
+
+# Types of items, with the label of their filter tab
+ITEM_TYPES = {
+    'text': 'Text',
+    'url': 'URL',
+    'mail': 'Mail',
+    'color': 'Color',
+    'image': 'Image',
+}
+
+# Delay (in ms) before reloading the settings after a change of the file
+SETTINGS_RELOAD_DELAY = 200
+
+# Number of frames kept for each allocation and number of entries shown in the profiling reports
+PROFILING_TRACEBACK_DEPTH = 10
+PROFILING_REPORT_ENTRIES = 40
+
+# Polling interval bounds (in seconds) of the database monitor (fast after an activity, ceiling when idle)
+MONITOR_MIN_INTERVAL = 0.01
+MONITOR_MAX_INTERVAL = 2.0
+
+# Minimum interval (in ms) between two render passes (one frame at 60 FPS)
+FRAME_INTERVAL = 16
+
+# Maximum number of items loaded in a single batch by the item loader
+LOADER_BATCH_SIZE = 50
+
+# Maximum number of cards rendered in the window
+MAX_RENDERED_CARDS = 200
+
+# Size of the image thumbnails (same as the cards)
+THUMBNAIL_SIZE = (350, 180)
+
+# Stylesheets shared by all the cards
+DATE_STYLESHEET = '''
+    #clipboard_date {
+        color: #cbcbcb;
+        font-size: 13px;
+        font-family: Courier New;
+        font-weight: bold;
+        background-color: rgba(26, 27, 28, 0.8);
+        border-radius: 9px;
+        text-align: center;
+        padding-left: 7px;
+        padding-right: 7px;
+        padding-top: 2px;
+        padding-bottom: 2px;
+        margin: 0px;
+        margin-left: 1px;
+        margin-bottom: 1px;
+    }
+'''
+
+DATA_STYLESHEET = '''
+    #clipboard_data {
+        color: #cbcbcb;
+        font-size: 16px;
+        font-weight: bold;
+        font-family: Courier New;
+        background-color: transparent;
+        border: none;
+    }
+'''
+
+ACTION_BUTTON_STYLESHEET = '''
+    #action_button {
+        background-color: transparent;
+        color: #a9a9a9;
+        border: none;
+        font-size: 20px;
+        padding: 0px;
+        font-weight: bold;
+        margin-top: -3px;
+    }
+    #action_button:hover {
+        color: #2089c9;
+    }
+'''
+
+COLOR_LABEL_STYLESHEET = '''
+    #color_label {
+        padding: 10px;
+        background-color: rgba(5, 5, 5, 0.6);
+        border-radius: 10px;
+        font-size: 20px;
+        font-family: Courier New;
+        font-weight: bold;
+    }
+'''
+
+# Settings class (typed view of settings.json, shared with the service, with defaults and validation)
+class Settings:
+    # Key in settings.json: (attribute, type, default, minimum, maximum)
+    FIELDS = {
+        'daysToKeep': ('days_to_keep', int, 7, 1, 36500),
+        'maxItems': ('max_items', int, 100, 1, 1000000),
+        'pollInterval': ('poll_interval', int, int(MONITOR_MIN_INTERVAL * 1000), 1, 1000),
+        'pollIntervalMax': ('poll_interval_max', int, int(MONITOR_MAX_INTERVAL * 1000), 10, 60000),
+        'maxCards': ('max_cards', int, MAX_RENDERED_CARDS, 1, 10000),
+        'thumbnailScale': ('thumbnail_scale', int, 100, 25, 400),
+        'cacheBudget': ('cache_budget', int, ITEM_CACHE_BUDGET // 1024, 16, 1024 * 1024),
+        'cacheSize': ('cache_size', int, ITEM_CACHE_SIZE, 10, 1000000),
+        'archiveAfterDays': ('archive_after_days', float, ARCHIVE_AFTER_DAYS, 0.01, 36500),
+    }
+
+    days_to_keep: int
+    max_items: int
+    poll_interval: int          # ms
+    poll_interval_max: int      # ms
+    max_cards: int
+    thumbnail_scale: int        # % of the card size
+    cache_budget: int           # KB
+    cache_size: int             # items
+    archive_after_days: float
+
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+
+        # Modification time of the file at the last load
+        self.mtime = None
+
+        # Start from the defaults
+        for attribute, _, default, _, _ in self.FIELDS.values():
+            setattr(self, attribute, default)
+
+        self.load()
+
+    # Load the file if it changed since the last load, return the names of the settings that changed
+    def load(self) -> set[str]:
+        try:
+            mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return set()
+
+        if mtime == self.mtime:
+            return set()
+        self.mtime = mtime
+
+        try:
+            values = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as error:
+            print(f'Unable to read the settings: {error}')
+            return set()
+
+        if not isinstance(values, dict):
+            print('Unable to read the settings: not a JSON object')
+            return set()
+
+        changed = set()
+        for key, (attribute, type_, default, minimum, maximum) in self.FIELDS.items():
+            value = self.validate(key, values.get(key, default), type_, default, minimum, maximum)
+            if value != getattr(self, attribute):
+                setattr(self, attribute, value)
+                changed.add(attribute)
+
+        return changed
+
+    @staticmethod
+    def validate(key: str, value, type_: type, default, minimum, maximum):
+        # Reject the values of the wrong type (bool is an int for Python) and the non finite ones (JSON accepts NaN and Infinity)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or (type_ is int and not float(value).is_integer()):
+            print(f'Invalid value for {key}: {value!r}, using {default}')
+            return default
+
+        # Clamp the values out of range
+        value = type_(value)
+        if not minimum <= value <= maximum:
+            clamped = min(max(value, minimum), maximum)
+            print(f'Value of {key} out of range: {value}, using {clamped}')
+            return clamped
+
+        return value
+
+    # Size of the thumbnails, derived from the card size so the images are never stretched
+    @property
+    def thumbnail_size(self) -> tuple[int, int]:
+        return tuple(round(side * self.thumbnail_scale / 100) for side in THUMBNAIL_SIZE)
+
 # Queryset class
 class Queryset:
-    def __init__(self, database: Database, items: list[ClipboardItem] = []):
+    def __init__(self, database: Database, items: list[ClipboardItem] | None = None):
         self.database = database
-        self.items = items
+        self.items = items if items is not None else []
 
     def append(self, item: ClipboardItem):
         self.items.append(item)
@@ -53,68 +270,454 @@ class Queryset:
 
 # Communication class
 class Communicate(QtCore.QObject):
-    new_item = Signal(int)
+    new_item = Signal(int, str)
+    counts_changed = Signal(object)
+    items_ready = Signal(object)
+    wake_up = Signal()
+
+# Profiling session (CPU profile per thread and allocation snapshots)
+class ProfilingSession:
+    def __init__(self):
+        self.started = datetime.datetime.now()
+
+        # Profilers and detach events of the profiled threads
+        self.profilers: dict[str, cProfile.Profile] = {}
+        self.detached: dict[str, threading.Event] = {}
+
+        # The threads attach and detach on their own, no thread can attach once the session is stopping
+        self.lock = threading.Lock()
+        self.stopping = False
+
+        # Trace the allocations from now on
+        tracemalloc.start(PROFILING_TRACEBACK_DEPTH)
+        self.snapshot = tracemalloc.take_snapshot()
+
+    # Start profiling the calling thread (cProfile only profiles the thread it is enabled in)
+    def attach(self, name: str):
+        with self.lock:
+            if self.stopping:
+                return
+
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Since Python 3.12 a single profiler is active at a time, and it already covers every thread
+                return
+            self.profilers[name] = profiler
+            self.detached[name] = threading.Event()
+
+    # Stop profiling the calling thread
+    def detach(self, name: str):
+        with self.lock:
+            if name in self.profilers:
+                self.profilers[name].disable()
+                self.detached[name].set()
+
+    # Wait for the threads to detach and write the report into the data directory
+    def stop(self, timeout: float = 1.0) -> pathlib.Path:
+        with self.lock:
+            self.stopping = True
+            detached = list(self.detached.items())
+
+        # Only report the threads that detached in time (a running profiler can't be read from another thread)
+        for _, event in detached:
+            event.wait(timeout)
+        profilers = {name: self.profilers[name] for name, event in detached if event.is_set()}
+        skipped = [name for name, event in detached if not event.is_set()]
+
+        # Compare the allocations with the start of the session
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stopped = datetime.datetime.now()
+        report = io.StringIO()
+        report.write(f'ClipIT profiling report\nStarted: {self.started:%Y-%m-%d %H:%M:%S}\nStopped: {stopped:%Y-%m-%d %H:%M:%S}\nDuration: {(stopped - self.started).total_seconds():.1f} s\n')
+
+        # CPU profile of each thread
+        for name in skipped:
+            report.write(f'\n===== CPU profile: {name} (still running, skipped) =====\n')
+        for name, profiler in profilers.items():
+            report.write(f'\n===== CPU profile: {name} =====\n')
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(PROFILING_REPORT_ENTRIES)
+
+        # Allocations made during the session
+        report.write(f'\n===== Allocations (traced: {current / 1024:.1f} KB, peak: {peak / 1024:.1f} KB) =====\n')
+        for stat in snapshot.compare_to(self.snapshot, 'lineno')[:PROFILING_REPORT_ENTRIES]:
+            report.write(f'{stat}\n')
+
+        # Write the report
+        path = PATH / f'profile-{self.started:%Y%m%d-%H%M%S}.txt'
+        path.write_text(report.getvalue(), encoding='utf-8')
+        return path
 
 # Database Monitor class
 class DatabaseMonitor(Thread):
 
-    def __init__(self, database: Database):
+    def __init__(self, database: Database, min_interval: float = MONITOR_MIN_INTERVAL, max_interval: float = MONITOR_MAX_INTERVAL):
         super(DatabaseMonitor, self).__init__()
         self.database = database
         self.running = True
         self.communicate = Communicate()
-        
-        self.delete_queue = []
 
+        # Polling interval bounds (in seconds)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+
+        # Poll fast while the window is shown
+        self.active = False
+
+        # Event used to interrupt the sleep of the monitor
+        self.wake_event = threading.Event()
+
+        # Profiling session to attach to (None when no session is running)
+        self.profiling: ProfilingSession | None = None
+
+        # Metrics (wakeup timestamps over the last minute, detection latency in seconds)
+        self.wakeups: deque[float] = deque()
+        self.last_latency = 0.0
+        self.average_latency = 0.0
+
+    # Wake the monitor up immediately and poll fast again
+    def wake(self):
+        self.wake_event.set()
+
+    def set_active(self, active: bool):
+        self.active = active
+        if active:
+            self.wake()
+
+    def stop(self):
+        self.running = False
+        self.wake()
+
+    def metrics(self) -> dict:
+        return {
+            'wakeups_per_minute': len(self.wakeups),
+            'interval': self.interval,
+            'last_latency': self.last_latency,
+            'average_latency': self.average_latency,
+        }
 
     def run(self):
         # Create a new cursor
-        conn = sqlite3.connect(self.database.database)
+        conn = self.database.connect()
         
         cursor = conn.cursor()
-        # Remember the last items found
-        last_items = []
+        # Remember the last items found (id: type)
+        last_items = {}
+
+        # Version of the database at the last scan (changes when another connection commits) and time of the last scan
+        last_version = None
+        last_scan = 0.0
+
+        # The items found by the first scan are already in the history, their latency is meaningless
+        first_scan = True
+
+        # Profiling session the monitor is attached to
+        profiled = None
 
         while self.running:
-            # Delete the items in the delete queue
-            for item in self.delete_queue:
-                self.database.delete(item, connection=conn)
-            
-            # Clear the delete queue
-            self.delete_queue = []
+            # Attach to a new profiling session or detach from a stopped one
+            if self.profiling is not profiled:
+                if profiled:
+                    profiled.detach('DatabaseMonitor')
+                profiled = self.profiling
+                if profiled:
+                    profiled.attach('DatabaseMonitor')
+
+            # Record the wakeup and forget the ones older than a minute
+            now = time.monotonic()
+            self.wakeups.append(now)
+            while self.wakeups[0] < now - 60:
+                self.wakeups.popleft()
+
+            activity = False
+
+            # Only scan the table if it changed since the last scan, or once per backoff ceiling so the image files deleted outside of the app are still noticed
+            cursor.execute('PRAGMA data_version;')
+            version = cursor.fetchone()[0]
+            if version != last_version or activity or now - last_scan >= self.max_interval:
+                last_version = version
+                last_scan = now
+
+                # Fetch the items from the database
+                cursor.execute('SELECT id, type, date, filepath FROM clipboard;')
+
+                result = cursor.fetchall()
+
+                items = []
+                for row in result:
+                    # If the item is an image, check if the file still exists
+                    if row[1] == 'image' and not os.path.exists(row[3]):
+                        self.database.delete(self.database.fetch(item_id=row[0], cursor=cursor).first(), connection=conn)
+                        continue
+                    items.append(row)
+
+                # Changes of the number of items per type
+                counts = {}
+
+                # Check if there are new items (newest first, so the loader can skip the ones above the card limit)
+                for item_id, item_type, date, _ in reversed(items):
+                    if item_id not in last_items:
+                        self.communicate.new_item.emit(item_id, item_type)
+                        counts[item_type] = counts.get(item_type, 0) + 1
+                        activity = True
+
+                        # Measure the delay between the copy and its detection (the dates are stored in seconds)
+                        if not first_scan:
+                            self.last_latency = max(0.0, time.time() - int(date))
+                            self.average_latency = self.average_latency * 0.9 + self.last_latency * 0.1 if self.average_latency else self.last_latency
+                
+                # Invalidate the cached items that are not live anymore (deleted or archived)
+                current_items = {row[0]: row[1] for row in items}
+                for item_id in last_items.keys() - current_items.keys():
+                    self.database.invalidate(item_id)
+                    counts[last_items[item_id]] = counts.get(last_items[item_id], 0) - 1
+
+                # Send the changes of the counts in a single signal
+                if any(counts.values()):
+                    self.communicate.counts_changed.emit(counts)
+
+                # Update the last items
+                last_items = current_items
+                first_scan = False
+
+            # Poll fast after an activity or while the window is shown, back off exponentially otherwise
+            if activity or self.active:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * 2, self.max_interval)
+
+            # Sleep until the next poll or until the monitor is woken up
+            if self.wake_event.wait(self.interval):
+                self.wake_event.clear()
+                self.interval = self.min_interval
 
-            # Fetch the items from the database
-            cursor.execute('SELECT * FROM clipboard;')
+        # Detach from the profiling session if any
+        if profiled:
+            profiled.detach('DatabaseMonitor')
+        cursor.close()
 
-            result = cursor.fetchall()
+# Render model of a card, prepared by the item loader
+class CardModel:
+    __slots__ = ('item', 'date', 'preview', 'bg_color', 'action_icon', 'stylesheet', 'thumbnail')
 
-            items = []
-            for row in result:
-                # If the item is an image, check if the file still exists
-                if row[1] == 'image' and not os.path.exists(row[4]):
-                    self.database.delete(self.database.fetch(item_id=row[0], cursor=cursor).first(), connection=conn)
-                    continue
-                items.append(row[0])
+    # The payload is passed explicitly: the item cache may drop item.data at any time to respect its budget
+    def __init__(self, item: ClipboardItem, data: str, thumbnail_size: tuple[int, int] = THUMBNAIL_SIZE):
+        self.item = item
 
-            
-            # Check if there are new items
-            for item in items:
-                if item not in last_items:
-                    self.communicate.new_item.emit(item)
-            
-            # Update the last items
-            last_items = items
+        # Format the date and the text shown on the card
+        self.date = item.get_date()
+        self.preview = item.preview(data) if item.type not in ('image', 'color') else ''
+
+        # Icon of the action button (url and mail only)
+        self.action_icon = None
+        if item.type not in ('text', 'image', 'color'):
+            self.action_icon = '' if (item.type == 'mail' or data.startswith('mailto:')) else ''
+
+        # Background color of the card (the color itself for color items)
+        self.bg_color = normalize_color(data) if item.type == 'color' else '#1a1b1c'
+
+        # Thumbnail of the image (QImage can safely be used outside of the GUI thread)
+        self.thumbnail = None
+        if item.type == 'image':
+            self.thumbnail = get_centered_scaled_image(item.file_path, QtCore.QSize(*thumbnail_size), radius=10)
+
+        # Build the stylesheet of the frame
+        if item.type == 'image':
+            self.stylesheet = f"""
+                #clipboard_frame_{item.id} {{
+                    border: 2.5px solid #a9a9a9;
+                    border-radius: 10px;
+                    padding: 0px;
+                    margin-left: 5px;
+                    margin-right: 5px;
+                }}
+                QFrame#clipboard_frame_{item.id}:hover {{
+                    border: 3.5px solid white;
+                }}
+                #image_frame {{
+                    border: none;
+                    padding: 0px;
+                    margin: 0px;
+                }}
+            """
+        else:
+            self.stylesheet = f"""
+                QFrame#clipboard_frame_{item.id} {{
+                    background-color: {self.bg_color};
+                    border: 1.5px solid #a9a9a9;
+                    border-radius: 10px;
+                    padding: 0px;
+                    padding-top: 3px;
+                    margin-left: 5px;
+                    margin-right: 5px;
+                }}
+                QFrame#clipboard_frame_{item.id}:hover {{
+                    border: 2.5px solid white;
+                }}
+            """
+
+# Item Loader class (fetches the items and prepares their cards off the GUI thread)
+class ItemLoader(Thread):
+
+    def __init__(self, database: Database, thumbnail_size: tuple[int, int] = THUMBNAIL_SIZE, limit: int = MAX_RENDERED_CARDS):
+        super(ItemLoader, self).__init__()
+        self.database = database
+        self.communicate = Communicate()
+
+        # Ids of the items to load (None stops the loader)
+        self.queue: queue.Queue[int | None] = queue.Queue()
+
+        # Size of the image thumbnails
+        self.thumbnail_size = thumbnail_size
+
+        # Maximum number of cards shown and smallest id that can still be shown (set by the GUI, None when there is room)
+        self.limit = limit
+        self.floor: int | None = None
+
+    def enqueue(self, item_id: int):
+        self.queue.put(item_id)
+
+    def stop(self):
+        self.queue.put(None)
+
+    def run(self):
+        # Create a new cursor
+        conn = self.database.connect()
+        cursor = conn.cursor()
+
+        running = True
+        while running:
+            # Wait for an item, give the rest of the burst a frame to arrive, then take all of it
+            item_ids = [self.queue.get()]
+            time.sleep(FRAME_INTERVAL / 1000)
+            while not self.queue.empty():
+                item_ids.append(self.queue.get())
+
+            if None in item_ids:
+                running = False
+
+            # Only prepare the newest items that can be shown, the others would be dropped by the GUI
+            floor = self.floor
+            item_ids = sorted({item_id for item_id in item_ids if item_id is not None and (floor is None or item_id >= floor)}, reverse=True)[:self.limit]
+
+            # Fetch the items and prepare their cards, newest first, in batches so the first cards show quickly
+            for start in range(0, len(item_ids), LOADER_BATCH_SIZE):
+                models = []
+                for item in self.database.fetch_ids(item_ids[start:start + LOADER_BATCH_SIZE], cursor=cursor).all():
+                    try:
+                        models.append(CardModel(item, self.database.items.payload(item, cursor=cursor), self.thumbnail_size))
+                    except Exception as error:
+                        print(f'Unable to prepare item {item.id}: {error}')
+
+                # Send the batch to the GUI
+                if models:
+                    self.communicate.items_ready.emit(models)
 
-            # Sleep for 10ms
-            time.sleep(0.01)
         cursor.close()
+        conn.close()
+
+# Archiver class (moves the old items into the archive database in small batches)
+class Archiver(Thread):
+
+    def __init__(self, database: Database, days: float = ARCHIVE_AFTER_DAYS):
+        super(Archiver, self).__init__()
+        self.database = database
+        self.running = True
+
+        # Age (in days) of the items to archive
+        self.days = days
+
+        # Event used to interrupt the sleep of the archiver
+        self.wake_event = threading.Event()
+
+        # Communication object (reports the number of items archived per type)
+        self.communicate = Communicate()
+
+    def stop(self):
+        self.running = False
+        self.wake_event.set()
+
+    def run(self):
+        # Create a new connection
+        conn = self.database.connect()
+
+        while self.running:
+            # Move a batch of old items
+            try:
+                counts = self.database.archive_old_items(int(time.time() - self.days * 86400), connection=conn)
+            except sqlite3.OperationalError as error:
+                # The database is locked by another writer, try again later
+                print(f'Unable to archive old items: {error}')
+                counts = {}
+            except sqlite3.IntegrityError as error:
+                # An id of the batch is already archived, nothing was moved (the history is left untouched)
+                print(f'ERROR: unable to archive old items, id collision with the archive: {error}')
+                counts = {}
+
+            moved = sum(counts.values())
+            if moved:
+                print(f'Archived {moved} items')
+                self.communicate.counts_changed.emit(counts)
+
+            # Keep going while there is a backlog (with a short pause to let the other writers in), else wait
+            self.wake_event.wait(ARCHIVE_BATCH_PAUSE if moved == ARCHIVE_BATCH_SIZE else ARCHIVE_INTERVAL)
+
+        conn.close()
 
 class Database:
     def __init__(self, database_path: str):
         self.database = database_path
-        self.connection = sqlite3.connect(database_path)
+
+        # Old items are moved into an archive database, attached to every connection
+        self.archive = pathlib.Path(database_path).with_name('clipboard_archive.db')
+
+        self.connection = self.connect()
         self.cursor = self.connection.cursor()
 
+        # Identity map of the items (every id maps to a single live item in the process)
+        self.items = ItemCache(self)
+
+    # Drop an item from the identity map (it changed or was removed)
+    def invalidate(self, item_id: int):
+        self.items.invalidate(item_id)
+
+    # Open a connection with the archive attached (the history view spans both databases)
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.database)
+        connection.execute('ATTACH DATABASE ? AS archive;', (str(self.archive),))
+        connection.execute('CREATE TABLE IF NOT EXISTS archive.clipboard (id INTEGER PRIMARY KEY, type TEXT, data TEXT, date TEXT, filepath TEXT);')
+        connection.execute('CREATE INDEX IF NOT EXISTS main.clipboard_date ON clipboard (date);')
+        connection.execute('CREATE INDEX IF NOT EXISTS main.clipboard_type ON clipboard (type, id);')
+        connection.execute('CREATE INDEX IF NOT EXISTS archive.clipboard_type ON clipboard (type, id);')
+
+        # Highest id ever used in either database, it survives the deletes so SQLite never reuses an archived id
+        connection.execute('CREATE TABLE IF NOT EXISTS main.clipboard_meta (key TEXT PRIMARY KEY, value INTEGER);')
+        connection.execute("INSERT OR IGNORE INTO main.clipboard_meta (key, value) VALUES ('high_water', 0);")
+        connection.execute(
+            "UPDATE main.clipboard_meta SET value = MAX(value, (SELECT IFNULL(MAX(id), 0) FROM main.clipboard), (SELECT IFNULL(MAX(id), 0) FROM archive.clipboard)) WHERE key = 'high_water';"
+        )
+
+        # The trigger lives in the database file, so it also renumbers the rows inserted by the service
+        connection.execute(
+            '''
+            CREATE TRIGGER IF NOT EXISTS main.clipboard_high_water AFTER INSERT ON clipboard
+            BEGIN
+                UPDATE clipboard SET id = (SELECT value FROM clipboard_meta WHERE key = 'high_water') + 1
+                    WHERE id = NEW.id AND NEW.id <= (SELECT value FROM clipboard_meta WHERE key = 'high_water');
+                UPDATE clipboard_meta SET value = (SELECT MAX(id) FROM clipboard)
+                    WHERE key = 'high_water' AND value < (SELECT MAX(id) FROM clipboard);
+            END;
+            '''
+        )
+        connection.execute('CREATE TEMP VIEW IF NOT EXISTS history AS SELECT * FROM main.clipboard UNION ALL SELECT * FROM archive.clipboard;')
+        connection.commit()
+        return connection
+
     def insert(self, item: ClipboardItem):
         self.cursor.execute('INSERT INTO clipboard (type, data, date, filepath) VALUES (?, ?, ?, ?)', (item.type, item.data, item.date, item.file_path))
         self.connection.commit()
@@ -135,42 +738,157 @@ class Database:
         result = Queryset(self, [])
 
         # Forge the query
+        filters = {key: value for key, value in kwargs.items() if value}
         query = 'SELECT * FROM clipboard'
-        if any(kwargs.values()):
-            query += ' WHERE ' + ' AND '.join([f'{key} = "{value}"' for key, value in kwargs.items() if value])
+        if filters:
+            query += ' WHERE ' + ' AND '.join([f'{key} = ?' for key in filters])
         query += ';'
-        
-
-        print(query)
 
         # Execute the query
-        cursor.execute(query)
+        cursor.execute(query, list(filters.values()))
 
-        # Parse the results
+        # Parse the results (through the identity map)
         for row in cursor.fetchall():
-            item = ClipboardItem(row[1], row[2], int(row[3]), row[4])
-            item.id = row[0]
-            result.append(item)
+            result.append(self.items.resolve(row))
 
         return result
     
-    def delete(self, item: ClipboardItem, connection: sqlite3.Connection = None):
+    def fetch_ids(self, item_ids: list[int], cursor: sqlite3.Cursor = None) -> Queryset:
+        # Use the provided cursor if any
+        if not cursor:
+            cursor = self.cursor
+
+        # Initialize a queryset
+        result = Queryset(self)
+
+        # Fetch all the items in a single query
+        cursor.execute(f'SELECT * FROM history WHERE id IN ({", ".join("?" * len(item_ids))});', item_ids)
+
+        # Parse the results (through the identity map)
+        for row in cursor.fetchall():
+            result.append(self.items.resolve(row))
+
+        return result
+
+    # Delete an item (live or archived), return True if it was archived
+    def delete(self, item: ClipboardItem, connection: sqlite3.Connection = None) -> bool:
         # Use the provided connection if any
         if not connection:
             connection = self.connection
         
         # Create a cursor
         cursor = connection.cursor()
-        cursor.execute('DELETE FROM clipboard WHERE id = ?', (item.id,))
+        cursor.execute('DELETE FROM main.clipboard WHERE id = ?', (item.id,))
+        cursor.execute('DELETE FROM archive.clipboard WHERE id = ?', (item.id,))
+        archived = cursor.rowcount > 0
         connection.commit()
         cursor.close()
 
+        self.invalidate(item.id)
+
         if item.type == 'image':
             try:
                 os.remove(item.file_path)
             except FileNotFoundError:
                 pass
 
+        return archived
+
+    # Number of archived items per type (served by the (type, id) index)
+    def count_archived(self, cursor: sqlite3.Cursor = None) -> dict[str, int]:
+        # Use the provided cursor if any
+        if not cursor:
+            cursor = self.cursor
+
+        cursor.execute('SELECT type, COUNT(*) FROM archive.clipboard GROUP BY type;')
+        return dict(cursor.fetchall())
+
+    def fetch_page_ids(self, type: str | None = None, before_id: int | None = None, limit: int = PAGE_SIZE, archived: bool = False, cursor: sqlite3.Cursor = None) -> list[int]:
+        # Use the provided cursor if any
+        if not cursor:
+            cursor = self.cursor
+
+        # Filter by type and start after the last page (served by the (type, id) index)
+        conditions = []
+        params = []
+        if type:
+            conditions.append('type = ?')
+            params.append(type)
+        if before_id is not None:
+            conditions.append('id < ?')
+            params.append(before_id)
+
+        # Page through the live or the archived items from the newest to the oldest
+        query = f'SELECT id FROM {"archive" if archived else "main"}.clipboard'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY id DESC LIMIT ?;'
+        cursor.execute(query, params + [limit])
+
+        return [row[0] for row in cursor.fetchall()]
+
+    # Move a batch of old items into the archive, return the number of items moved per type
+    def archive_old_items(self, before: int, limit: int = ARCHIVE_BATCH_SIZE, connection: sqlite3.Connection = None) -> dict[str, int]:
+        # Use the provided connection if any
+        if not connection:
+            connection = self.connection
+
+        cursor = connection.cursor()
+
+        # Select a batch of old items (below the high water id, which is never reused)
+        cursor.execute(
+            "SELECT id, type FROM main.clipboard WHERE date < ? AND id < (SELECT value FROM main.clipboard_meta WHERE key = 'high_water') ORDER BY id LIMIT ?;",
+            (str(before), limit)
+        )
+        rows = cursor.fetchall()
+        item_ids = [row[0] for row in rows]
+
+        # Move the batch into the archive in a single transaction (an id collision fails instead of overwriting the history)
+        if item_ids:
+            placeholders = ', '.join('?' * len(item_ids))
+            try:
+                cursor.execute(f'INSERT INTO archive.clipboard SELECT * FROM main.clipboard WHERE id IN ({placeholders});', item_ids)
+                cursor.execute(f'DELETE FROM main.clipboard WHERE id IN ({placeholders});', item_ids)
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+        else:
+            cursor.close()
+
+        moved = {}
+        for _, item_type in rows:
+            moved[item_type] = moved.get(item_type, 0) + 1
+        return moved
+
+    # Delete all the items (live and archived) and their image files
+    def purge(self, connection: sqlite3.Connection = None):
+        # Use the provided connection if any
+        if not connection:
+            connection = self.connection
+
+        cursor = connection.cursor()
+
+        # Collect the image files before their rows are deleted
+        cursor.execute("SELECT filepath FROM history WHERE type = 'image';")
+        file_paths = [row[0] for row in cursor.fetchall() if row[0]]
+
+        cursor.execute('DELETE FROM main.clipboard;')
+        cursor.execute('DELETE FROM archive.clipboard;')
+        connection.commit()
+        cursor.close()
+
+        for file_path in file_paths:
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+        # None of the cached items exists anymore
+        self.items.clear()
+
     def close(self):
         self.connection.close()
 
@@ -182,15 +900,31 @@ class Database:
             self.cursor.execute('INSERT INTO clipboard (type, data, date, filepath) VALUES (?, ?, ?, ?)', (item.type, item.data, item.date, item.file_path))
             self.connection.commit()
 
-            # Fetch the id of the last inserted item
-            self.cursor.execute('SELECT last_insert_rowid();')
+            # Fetch the id of the last inserted item (the high water trigger may have renumbered it)
+            self.cursor.execute('SELECT MAX(id) FROM main.clipboard;')
             item.id = self.cursor.fetchone()[0]
 
+        # The saved item becomes the live item of its id
+        self.items.add(item)
+
+    def load_payload(self, item: ClipboardItem, cursor: sqlite3.Cursor = None):
+        # Use the provided cursor if any
+        if not cursor:
+            cursor = self.cursor
+
+        # Reload the data of the item from the database
+        cursor.execute('SELECT data FROM history WHERE id = ?', (item.id,))
+        row = cursor.fetchone()
+        item.data = row[0] if row else ''
+
     def __del__(self):
         self.connection.close()
 
 # Clipboard item model
 class ClipboardItem:
+    # Use slots to keep the per-item overhead low
+    __slots__ = ('id', 'type', 'data', 'date', 'file_path')
+
     def __init__(self, type: str, data: str, date: int, file_path: str = None):
         self.type = type
         self.data = data
@@ -202,16 +936,176 @@ class ClipboardItem:
 
     # Return the item data as a string
     def __str__(self):
-        return self.file_path if self.type == "image" else self.data
+        return self.file_path if self.type == "image" else (self.data or '')
     
     def get_date(self):
         return datetime.datetime.fromtimestamp(self.date).strftime('%Y-%d-%m %H:%M:%S')
 
+    # Return the text shown on the card (truncated, the card can't show more anyway)
+    def preview(self, data: str | None = None, length: int = PREVIEW_LENGTH):
+        text = self.file_path if self.type == 'image' else (data if data is not None else str(self))
+        return text if len(text) <= length else text[:length] + '…'
+
+    # Check if the payload of the item is in memory
+    @property
+    def loaded(self):
+        return self.data is not None
+
+    # Approximate size (in bytes) of the payload in memory
+    def payload_size(self):
+        return sys.getsizeof(self.data) if self.data is not None else 0
+
+    # Drop the payload, only the id and the metadata are kept
+    def unload(self):
+        self.data = None
+
+# Item cache, identity map of the items keeping their payloads within a memory budget
+class ItemCache:
+    def __init__(self, database: Database, budget: int = ITEM_CACHE_BUDGET, max_items: int = ITEM_CACHE_SIZE):
+        self.database = database
+        self.budget = budget
+        self.max_items = max_items
+
+        # Items ordered from the least to the most recently used
+        self.items: OrderedDict[int, ClipboardItem] = OrderedDict()
+
+        # Ids of the items whose payload is in memory, ordered the same way (dropping a payload is O(1))
+        self.loaded: OrderedDict[int, None] = OrderedDict()
+
+        # Size (in bytes) of the payloads currently in memory
+        self.resident = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        # The items are resolved from the GUI, the loader and the monitor threads
+        self.lock = threading.RLock()
+
+    # Mark an item of the map as the most recently used (and account for its payload if it was just loaded)
+    def mark_used(self, item: ClipboardItem):
+        self.items.move_to_end(item.id)
+        if item.loaded:
+            if item.id not in self.loaded:
+                self.resident += item.payload_size()
+            self.loaded[item.id] = None
+            self.loaded.move_to_end(item.id)
+
+    # Return the live item of a row, creating it on the first load
+    def resolve(self, row: tuple) -> ClipboardItem:
+        with self.lock:
+            item = self.items.get(row[0])
+            if item is None:
+                self.misses += 1
+                item = ClipboardItem(row[1], row[2], int(row[3]), row[4])
+                item.id = row[0]
+                self.items[item.id] = item
+            else:
+                self.hits += 1
+
+                # Refresh the payload if it has been dropped
+                if not item.loaded:
+                    item.data = row[2]
+
+            self.mark_used(item)
+            self.trim()
+            return item
+
+    def add(self, item: ClipboardItem):
+        with self.lock:
+            # Replace the previous version of the item if any
+            self.remove(item.id)
+
+            self.items[item.id] = item
+            self.mark_used(item)
+            self.trim()
+
+    # Return the item with the given id, or None if it has been deleted from the database
+    def get(self, item_id: int) -> ClipboardItem | None:
+        with self.lock:
+            item = self.items.get(item_id)
+
+            # Load the item if it is not in the map anymore
+            if item is None:
+                items = self.database.fetch_ids([item_id]).all()
+                return items[0] if items else None
+
+            self.hits += 1
+
+            # Reload the payload if it has been dropped
+            if not item.loaded:
+                self.database.load_payload(item)
+
+            # Mark the item as the most recently used
+            self.mark_used(item)
+            self.trim()
+
+            return item
+
+    # Return the payload of an item, reloading it if it has been dropped (the caller holds the returned string, a later trim can't drop it)
+    def payload(self, item: ClipboardItem, cursor: sqlite3.Cursor = None) -> str:
+        with self.lock:
+            data = item.data
+            if data is None:
+                self.database.load_payload(item, cursor=cursor)
+                data = item.data
+
+                # Only account for the items of the map (an evicted item is not tracked anymore)
+                if self.items.get(item.id) is item:
+                    self.mark_used(item)
+                    self.trim()
+
+            return data
+
+    def remove(self, item_id: int) -> ClipboardItem | None:
+        with self.lock:
+            item = self.items.pop(item_id, None)
+            if item_id in self.loaded:
+                del self.loaded[item_id]
+                self.resident -= item.payload_size()
+            return item
+
+    def invalidate(self, item_id: int):
+        if self.remove(item_id):
+            self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+            self.loaded.clear()
+            self.resident = 0
+
+    def trim(self):
+        with self.lock:
+            # Forget the least recently used items above the maximum size
+            while len(self.items) > self.max_items:
+                self.remove(next(iter(self.items)))
+
+            # Drop the payloads of the least recently used items until the budget is respected (the last used payload is always kept)
+            while self.resident > self.budget and len(self.loaded) > 1:
+                item_id, _ = self.loaded.popitem(last=False)
+                item = self.items[item_id]
+                self.resident -= item.payload_size()
+                item.unload()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'items': len(self.items),
+            'resident': self.resident,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
 # Application Main Window
 class ApplicationWindow(QtWidgets.QMainWindow):
-    def __init__(self, database: Database):
+    def __init__(self, database: Database, settings: Settings):
         super(ApplicationWindow, self).__init__()
         self.database = database
+        self.settings = settings
         
         # Set the window transparent and frameless
         self.setWindowFlags(
@@ -328,6 +1222,31 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             '''
         )
 
+        # Create the button showing the older (archived) items
+        older_button = QtWidgets.QPushButton('')
+        older_button.setFont(QtGui.QFont(self.fontawesome))
+        older_button.setObjectName('older_button')
+        older_button.setToolTip('Show older items')
+        older_button.clicked.connect(self.show_older)
+        older_button.setFixedSize(30, 30)
+        header_layout.insertWidget(header_layout.indexOf(purge_button), older_button)
+
+        older_button.setStyleSheet(
+            '''
+            #older_button {
+                background-color: transparent;
+                color: #a9a9a9;
+                border: none;
+                font-size: 25px;
+                padding: 0px;
+                font-weight: bold;
+            }
+            #older_button:hover {
+                color: #2089c9;
+            }
+            '''
+        )
+
         # Create the close button
         close_button = QtWidgets.QPushButton('')
         close_button.setFont(QtGui.QFont(self.fontawesome))
@@ -355,6 +1274,42 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         # Add the header to the main layout
         layout.addWidget(header)
 
+        # Create the type filter tabs (the counts are updated from the monitor)
+        self.filter_tabs = QtWidgets.QTabBar()
+        self.filter_tabs.setObjectName('filter_tabs')
+        self.filter_tabs.setDrawBase(False)
+        self.filter_tabs.addTab('All')
+        for label in ITEM_TYPES.values():
+            self.filter_tabs.addTab(label)
+        self.filter_tabs.currentChanged.connect(self.filter_changed)
+        layout.addWidget(self.filter_tabs)
+
+        self.filter_tabs.setStyleSheet(
+            '''
+            QTabBar::tab {
+                background-color: transparent;
+                color: #a9a9a9;
+                border: none;
+                font-size: 14px;
+                font-weight: bold;
+                font-family: Courier New;
+                padding: 2px 10px;
+            }
+            QTabBar::tab:selected {
+                color: white;
+                border-bottom: 2px solid #2089c9;
+            }
+            QTabBar::tab:hover {
+                color: #2089c9;
+            }
+            '''
+        )
+
+        # Type of the items shown (None for all) and number of live and archived items per type
+        self.type_filter: str | None = None
+        self.type_counts = {item_type: 0 for item_type in ITEM_TYPES}
+        self.archived_counts = {item_type: 0 for item_type in ITEM_TYPES}
+
 
         # Create a scrollable frame for the logs (horizontal, hide the scrollbar)
         clipboardScroll = QtWidgets.QScrollArea()
@@ -378,19 +1333,23 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         # Create a QWheelEvent for the scroll area to scroll horizontally
         clipboardScroll.wheelEvent = lambda event: clipboardScroll.horizontalScrollBar().setValue(clipboardScroll.horizontalScrollBar().value() - event.angleDelta().y()*.5)
 
+        # Load the next page when the end of the scroll area is reached
+        self.scroll_bar = clipboardScroll.horizontalScrollBar()
+        self.scroll_bar.valueChanged.connect(self.scrolled)
+
         self.clipboardLayout = QtWidgets.QHBoxLayout()
         self.clipboardLayout.setAlignment(QtCore.Qt.AlignLeft)
         self.clipboardLayout.setSpacing(0)
         self.clipboardLayout.setContentsMargins(0, 0, 0, 0)
 
-        clipboardWidget = QtWidgets.QWidget()
-        clipboardWidget.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
-        clipboardWidget.setFixedHeight(200)
-        clipboardWidget.setLayout(self.clipboardLayout)
-        clipboardScroll.setWidget(clipboardWidget)
-        clipboardWidget.setObjectName('clipboard_widget')
+        self.clipboardWidget = QtWidgets.QWidget()
+        self.clipboardWidget.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        self.clipboardWidget.setFixedHeight(200)
+        self.clipboardWidget.setLayout(self.clipboardLayout)
+        clipboardScroll.setWidget(self.clipboardWidget)
+        self.clipboardWidget.setObjectName('clipboard_widget')
 
-        clipboardWidget.setStyleSheet(
+        self.clipboardWidget.setStyleSheet(
             '''
             QWidget#clipboard_widget {
                 background-color: transparent;
@@ -401,8 +1360,42 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             '''
         )
 
-        # Save the clipboard data into a dictionary
-        self.clipboard_data: dict[int, ClipboardItem] = {}
+        # The clipboard data is served by the item cache of the database (bounded memory footprint)
+        self.clipboard_data = self.database.items
+
+        # Size the cache from the settings before any thread loads items
+        self.clipboard_data.budget = self.settings.cache_budget * 1024
+        self.clipboard_data.max_items = self.settings.cache_size
+
+        # Rendered cards and their item types, by item id (the ids are also kept sorted to place new cards)
+        self.cards: dict[int, QtWidgets.QFrame] = {}
+        self.card_types: dict[int, str] = {}
+        self.card_ids: list[int] = []
+
+        # Number of cards loaded on demand (next pages and archived items, added to the card limit), oldest archived item shown and last page requested
+        self.older_cards = 0
+        self.oldest_archived: int | None = None
+        self.page_before: int | None = None
+
+        # Prepared items waiting to be rendered, flushed at most once per frame
+        self.pending_cards: list[CardModel] = []
+        self.render_timer = QtCore.QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(FRAME_INTERVAL)
+        self.render_timer.timeout.connect(self.render_pending)
+
+        # Start the item loader (fetches and prepares the items off the GUI thread)
+        self.loader = ItemLoader(self.database, thumbnail_size=self.settings.thumbnail_size, limit=self.settings.max_cards)
+        self.loader.communicate.items_ready.connect(self.items_ready)
+        self.loader.start()
+
+        # Count the archived items once, the archiver then reports the items it moves
+        self.archived_changed(self.database.count_archived())
+
+        # Start the archiver (keeps the live table small)
+        self.archiver = Archiver(self.database, days=self.settings.archive_after_days)
+        self.archiver.communicate.counts_changed.connect(self.archived_changed)
+        self.archiver.start()
 
         # Tray icon
         self.tray_icon = QtWidgets.QSystemTrayIcon(self)
@@ -410,35 +1403,186 @@ class ApplicationWindow(QtWidgets.QMainWindow):
 
         self.tray_icon.setToolTip('ClipIT service')
         tray_menu = QtWidgets.QMenu()
+
+        # Profiling (the action toggles the session)
+        self.profiling: ProfilingSession | None = None
+        self.profiling_action = QtGui.QAction('Start profiling', self)
+        self.profiling_action.triggered.connect(self.toggle_profiling)
+        tray_menu.addAction(self.profiling_action)
+
         quit_action = QtGui.QAction('Quit', self)
         quit_action.triggered.connect(self.exit)
         tray_menu.addAction(quit_action)
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.show()
 
+        # Report the resident memory and the monitor metrics regularly in the tray tooltip so long running sessions can be checked
+        self.metrics_timer = QtCore.QTimer(self)
+        self.metrics_timer.timeout.connect(self.report_metrics)
+        self.metrics_timer.start(METRICS_REPORT_INTERVAL)
+
         # Start the database monitor
-        self.monitor = DatabaseMonitor(self.database)
+        self.monitor = DatabaseMonitor(
+            self.database,
+            min_interval=self.settings.poll_interval / 1000,
+            max_interval=max(self.settings.poll_interval_max, self.settings.poll_interval) / 1000
+        )
         self.monitor.communicate.new_item.connect(self.new_item)
+        self.monitor.communicate.counts_changed.connect(self.counts_changed)
         self.monitor.start()
 
+        # Apply the settings, and again whenever the file changes
+        self.apply_settings()
+        self.settings_watcher = QtCore.QFileSystemWatcher(self)
+        self.settings_watcher.fileChanged.connect(self.settings_changed)
+        self.settings_watcher.directoryChanged.connect(self.settings_directory_changed)
+        self.watch_settings()
+
+        # Reload the settings once the writes are over
+        self.settings_timer = QtCore.QTimer(self)
+        self.settings_timer.setSingleShot(True)
+        self.settings_timer.setInterval(SETTINGS_RELOAD_DELAY)
+        self.settings_timer.timeout.connect(self.reload_settings)
+
         # Set the sleeping state to false
         self.sleeping = False
 
+        # The hotkey is handled in another thread, the window is shown through a signal
+        self.communicate = Communicate()
+        self.communicate.wake_up.connect(self.show_window)
+
         # Add the hotkey to show the window
         keyboard.add_hotkey('ctrl+alt+v', self.wake_up)
 
         # Start the application in the background
         self.hibernate()
 
+    @QtCore.Slot(int, str)
+    def new_item(self, item_id, item_type):
+        # Ignore the items hidden by the type filter
+        if self.type_filter and item_type != self.type_filter:
+            return
+
+        # Let the loader fetch and prepare the item off the GUI thread
+        self.loader.enqueue(item_id)
+
+    @QtCore.Slot(object)
+    def counts_changed(self, counts):
+        # Apply the changes sent by the monitor (no need to count the rows again)
+        for item_type, delta in counts.items():
+            if item_type in self.type_counts:
+                self.type_counts[item_type] += delta
+        self.update_tab_counts()
+
+    @QtCore.Slot(object)
+    def archived_changed(self, counts):
+        # Apply the changes sent by the archiver (the monitor only sees the archived items leave the live table)
+        for item_type, delta in counts.items():
+            if item_type in self.archived_counts:
+                self.archived_counts[item_type] += delta
+        self.update_tab_counts()
+
+    # Update the labels of the tabs with the number of items of the whole history (live and archived)
+    def update_tab_counts(self):
+        totals = {item_type: self.type_counts[item_type] + self.archived_counts[item_type] for item_type in ITEM_TYPES}
+        self.filter_tabs.setTabText(0, f'All ({sum(totals.values())})')
+        for index, (item_type, label) in enumerate(ITEM_TYPES.items(), start=1):
+            self.filter_tabs.setTabText(index, f'{label} ({totals[item_type]})')
+
+    @QtCore.Slot(int)
+    def filter_changed(self, index):
+        # Get the type of the tab (the first tab shows all the items)
+        self.type_filter = list(ITEM_TYPES)[index - 1] if index > 0 else None
+
+        # Remove the cards of the previous view
+        self.older_cards = 0
+        self.oldest_archived = None
+        self.page_before = None
+        self.clear_cards()
+
+        # Load the first page of the view
+        for item_id in self.database.fetch_page_ids(type=self.type_filter, limit=self.settings.max_cards):
+            self.loader.enqueue(item_id)
+
     @QtCore.Slot(int)
-    def new_item(self, item_id):
+    def scrolled(self, value):
+        if value >= self.scroll_bar.maximum() - PAGE_THRESHOLD and self.card_ids:
+            self.load_next_page()
+
+    def load_next_page(self):
+        # Only request each page once (the loader is asynchronous)
+        before_id = self.card_ids[0]
+        if before_id == self.page_before:
+            return
+        self.page_before = before_id
+
+        # Fetch the next live page of the view and make room for it
+        item_ids = self.database.fetch_page_ids(type=self.type_filter, before_id=before_id)
+        self.older_cards += len(item_ids)
+        self.update_card_floor()
+        for item_id in item_ids:
+            self.loader.enqueue(item_id)
+
+    @QtCore.Slot(object)
+    def items_ready(self, models):
+        # Queue the prepared items, they are rendered together on the next frame
+        self.pending_cards.extend(models)
+        if not self.render_timer.isActive():
+            self.render_timer.start()
+
+    def render_pending(self):
+        models, self.pending_cards = self.pending_cards, []
+
+        # Skip the items loaded before a filter change
+        if self.type_filter:
+            models = [model for model in models if model.item.type == self.type_filter]
+
+        # Only build the cards that stay under the limit (the newest ones, rendered or pending)
+        limit = self.settings.max_cards + self.older_cards
+        item_ids = sorted(set(self.card_ids).union(model.item.id for model in models))
+        if len(item_ids) > limit:
+            models = [model for model in models if model.item.id >= item_ids[-limit]]
+
+        # Render the whole batch with a single layout pass
+        self.clipboardWidget.setUpdatesEnabled(False)
+        for model in models:
+            self.render_card(model)
+
+        # Drop the oldest cards above the rendered card limit (the items stay in the database)
+        while len(self.card_ids) > limit:
+            item_id = self.card_ids.pop(0)
+            frame = self.cards.pop(item_id)
+            del self.card_types[item_id]
+            self.clipboardLayout.removeWidget(frame)
+            frame.deleteLater()
+
+        self.clipboardWidget.setUpdatesEnabled(True)
+        self.update_card_floor()
+
+        # Update the UI
+        self.update()
+
+    # Tell the loader which items can still be shown, so it doesn't prepare the others
+    def update_card_floor(self):
+        limit = self.settings.max_cards + self.older_cards
+        self.loader.limit = limit
+        self.loader.floor = self.card_ids[-limit] if len(self.card_ids) >= limit else None
+
+    def render_card(self, model: CardModel):
+        item = model.item
+        item_id = item.id
+
+        # Replace the card of the item if it is already rendered
+        if item_id in self.cards:
+            frame = self.cards.pop(item_id)
+            self.card_ids.remove(item_id)
+            self.clipboardLayout.removeWidget(frame)
+            frame.deleteLater()
+
         # Create a frame for the item
         frame = QtWidgets.QFrame()
         frame.setObjectName(f'clipboard_frame_{item_id}')
 
-        bg_color = "#1a1b1c"
-        is_image = False
-
         # Expand height to content
         frame.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         frame.setFixedSize(350, 180)
@@ -451,48 +1595,22 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         frame_layout.setContentsMargins(0, 0, 0, 0)
         frame_layout.setSpacing(0)
 
-        # Fetch the item from the database
-        item = self.database.fetch(item_id=item_id).first()
-        self.clipboard_data[item_id] = item
-
         # Create a label for the date
-        date = QtWidgets.QLabel(item.get_date())
+        date = QtWidgets.QLabel(model.date)
         date.setObjectName('clipboard_date')
         date.setFixedWidth(180)
-        date.setStyleSheet(
-            '''
-            #clipboard_date {
-                color: #cbcbcb;
-                font-size: 13px;
-                font-family: Courier New;
-                font-weight: bold;
-                background-color: rgba(26, 27, 28, 0.8);
-                border-radius: 9px;
-                text-align: center;
-                padding-left: 7px;
-                padding-right: 7px;
-                padding-top: 2px;
-                padding-bottom: 2px;
-                margin: 0px;
-                margin-left: 1px;
-                margin-bottom: 1px;
-            }
-            '''
-        )
+        date.setStyleSheet(DATE_STYLESHEET)
         date.adjustSize()
         
-        # If the item is an image, set it as the background of the frame
+        # If the item is an image, show its thumbnail as the background of the frame
         if item.type == 'image':
-            # Prevent background color from showing
-            is_image = True
-
-            # Create a frame for the image that expands to cover the whole frame
-            image_frame = QtWidgets.QFrame()
+            # Create a label for the thumbnail that covers the whole frame
+            image_frame = QtWidgets.QLabel()
             image_frame.setObjectName('image_frame')
             image_frame.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
-
-            #  Convert the image path to a URL format
-            file_path = item.file_path.replace('\\', '/')
+            image_frame.setScaledContents(True)
+            if model.thumbnail is not None:
+                image_frame.setPixmap(QtGui.QPixmap.fromImage(model.thumbnail))
 
             # Add a layout to the image frame
             image_layout = QtWidgets.QVBoxLayout()
@@ -512,8 +1630,6 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             # Set the margins/padding of the image frame to 0 to remove the border
             image_layout.setContentsMargins(0, 0, 0, 0)
             image_layout.setSpacing(0)
-            
-
         
         # If the if a tetx/url/mail, create a TextEdit for the item data (not editable or scrollable)
         elif item.type != 'color':
@@ -522,7 +1638,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             data = QtWidgets.QTextEdit()
             data.setObjectName('clipboard_data')
             data.setReadOnly(True)
-            data.setPlainText(str(item))
+            data.setPlainText(model.preview)
             data.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
 
             # Disable scroll
@@ -532,18 +1648,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             data.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
 
             # Set the style of the text edit
-            data.setStyleSheet(
-                '''
-                #clipboard_data {
-                    color: #cbcbcb;
-                    font-size: 16px;
-                    font-weight: bold;
-                    font-family: Courier New;
-                    background-color: transparent;
-                    border: none;
-                }
-                '''
-            )
+            data.setStyleSheet(DATA_STYLESHEET)
 
             # Add the data to the frame layout
             frame_layout.addWidget(data)
@@ -552,7 +1657,7 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             frame_layout.addWidget(date)
 
             # If the item is not raw text, add a latout at the bottom to display an action button near the date
-            if item.type != 'text':
+            if model.action_icon:
                 action_frame = QtWidgets.QFrame()
                 action_frame.setObjectName('action_frame')
                 frame_layout.addWidget(action_frame)
@@ -565,74 +1670,34 @@ class ApplicationWindow(QtWidgets.QMainWindow):
                 # Add a stretch to the layout so the date is at the bottom
                 action_layout.addStretch(4)
 
-                # Create a button to copy the item to the clipboard
-                action_button = QtWidgets.QPushButton('' if (item.type == 'mail' or item.data.startswith('mailto:')) else '')
+                # Create a button to open the item
+                action_button = QtWidgets.QPushButton(model.action_icon)
 
                 # Set the method on button click
-                action_button.clicked.connect(lambda: os.system(f"start {'mailto://' if item.type == 'mail' else ''}{item.data}"))
+                action_button.clicked.connect(lambda: self.open_item(item_id))
 
                 # Set the style of the button
                 action_button.setObjectName('action_button')
                 action_button.setFixedSize(20, 20)
-                action_button.setStyleSheet(
-                    '''
-                    #action_button {
-                        background-color: transparent;
-                        color: #a9a9a9;
-                        border: none;
-                        font-size: 20px;
-                        padding: 0px;
-                        font-weight: bold;
-                        margin-top: -3px;
-                    }
-                    #action_button:hover {
-                        color: #2089c9;
-                    }
-                    '''
-                )
+                action_button.setStyleSheet(ACTION_BUTTON_STYLESHEET)
 
                 # Add the button to the layout
                 action_layout.addWidget(action_button)
 
                 action_layout.addStretch(1)
 
-        # If the item is a color, create a frame with the color as the background (remove the alpha channel)
+        # If the item is a color, create a frame with the color as the background
         else:
-            color = item.data
-            # If the color is in the format #RRGGBBAA, remove the alpha channel
-            if color.startswith('#') and len(color) == 9:
-                color = color[:7]
-            
-            # Else, if there is  4 values (3 ','), remove the alpha channel
-            elif color.count(',') == 3:
-                color = color[:color.rfind(',')] + ')'
-                print(color)
-
-            # Set the background color of the frame
-            bg_color = color
-
             # Add a stretch to the layout so the date is at the bottom
             frame_layout.addStretch(1)
 
             # Add an horizontal layout to the frame to center the color label
             color_layout = QtWidgets.QHBoxLayout()
 
-
             # Create a label for the color
-            color_label = QtWidgets.QLabel(color)
+            color_label = QtWidgets.QLabel(model.bg_color)
             color_label.setObjectName('color_label')
-            color_label.setStyleSheet(
-                '''
-                #color_label {
-                    padding: 10px;
-                    background-color: rgba(5, 5, 5, 0.6);
-                    border-radius: 10px;
-                    font-size: 20px;
-                    font-family: Courier New;
-                    font-weight: bold;
-                }
-                '''
-            )
+            color_label.setStyleSheet(COLOR_LABEL_STYLESHEET)
 
             # Add the color label to the layout
             color_layout.addStretch(1)
@@ -648,87 +1713,175 @@ class ApplicationWindow(QtWidgets.QMainWindow):
             # Add the date to the frame layout
             frame_layout.addWidget(date)
 
-        # Set the background color of the frame
-        if not is_image:
-            print(item_id, bg_color, item.type)
-            frame.setStyleSheet(
-                f'''
-                QFrame#clipboard_frame_{item_id} {'{'}
-                    background-color: {bg_color};
-                    border: 1.5px solid #a9a9a9;
-                    border-radius: 10px;
-                    padding: 0px;
-                    padding-top: 3px;
-                    margin-left: 5px;
-                    margin-right: 5px;
-                {'}'}
-                QFrame#clipboard_frame_{item_id}:hover {'{'}
-                    border: 2.5px solid white;
-
-                {'}'}
-            ''')
-
-        # Apply the style to the frame for image items
-        else:
-            # Convert the file path to a URL format
-            file_path = item.file_path.replace('\\', '/')
-
-            # Apply the stylesheet with proper settings
-            frame.setStyleSheet(
-                f'''
-                #clipboard_frame_{item_id} {{
-                    
-
-                    border: 2.5px solid #a9a9a9;
-                    border-radius: 10px;
-                    padding: 0px;
-                    margin-left: 5px;
-                    margin-right: 5px;
-
-                }}
-                QFrame#clipboard_frame_{item_id}:hover {{
-                    border: 3.5px solid white;
-                }}
-                '''
-            )
-
-            # Set the background image of the frame
-            image_frame.setStyleSheet(
-                f'''
-                #image_frame {{
-                    border: 1.5px solid #a9a9a9;
-                    border-image: url({file_path}) 0 0 0 0 stretch stretch;
-                    border-radius: 10px;
-                    padding: 0px;
-                    margin: 0px;
-                }}
-                '''
-            )
+        # Apply the style prepared by the loader to the frame
+        frame.setStyleSheet(model.stylesheet)
 
         # Set the method on frame click
-        frame.mousePressEvent = lambda event: self.push_clipboard(item.id, frame)
-
-        # Add the date to the frame layout
-        #frame_layout.addWidget(date)
-
-        # Add the frame to the clipboard layout
-        self.clipboardLayout.insertWidget(0, frame)
-
-        # Update the UI
-        self.update()
+        frame.mousePressEvent = lambda event: self.push_clipboard(item_id, frame)
+
+        # Insert the frame so the cards stay sorted from the newest to the oldest
+        position = bisect.bisect(self.card_ids, item_id)
+        self.card_ids.insert(position, item_id)
+        self.cards[item_id] = frame
+        self.card_types[item_id] = item.type
+        self.clipboardLayout.insertWidget(len(self.card_ids) - 1 - position, frame)
+
+    def open_item(self, item_id):
+        # Get the item from the clipboard data (reloads the payload if needed)
+        item = self.clipboard_data.get(item_id)
+
+        # Drop the card if the item has been deleted meanwhile
+        if item is None:
+            self.remove_card(item_id)
+            return
+
+        os.system(f"start {'mailto://' if item.type == 'mail' else ''}{self.clipboard_data.payload(item)}")
+
+    @QtCore.Slot(str)
+    def settings_changed(self, path):
+        self.watch_settings()
+        self.settings_timer.start()
+
+    @QtCore.Slot(str)
+    def settings_directory_changed(self, path):
+        # Only the creation of the settings file matters (the directory is only watched while it is missing)
+        if self.settings.path.exists():
+            self.watch_settings()
+            self.settings_timer.start()
+
+    # Watch the settings file, or its directory while the file doesn't exist (the databases journals would wake the GUI on every write)
+    def watch_settings(self):
+        file_path = str(self.settings.path)
+        directory = str(self.settings.path.parent)
+
+        if self.settings.path.exists():
+            if file_path not in self.settings_watcher.files():
+                self.settings_watcher.addPath(file_path)
+            if directory in self.settings_watcher.directories():
+                self.settings_watcher.removePath(directory)
+        elif directory not in self.settings_watcher.directories():
+            self.settings_watcher.addPath(directory)
+
+    def reload_settings(self):
+        # Editors often replace the file, watch it again
+        self.watch_settings()
+
+        changed = self.settings.load()
+        if changed:
+            print(f'Settings changed: {", ".join(sorted(changed))}')
+            self.apply_settings(changed)
+
+    def apply_settings(self, changed: set[str] | None = None):
+        settings = self.settings
+
+        # Polling of the database monitor
+        self.monitor.min_interval = settings.poll_interval / 1000
+        self.monitor.max_interval = max(settings.poll_interval_max, settings.poll_interval) / 1000
+        self.monitor.wake()
+
+        # Item cache
+        self.clipboard_data.budget = settings.cache_budget * 1024
+        self.clipboard_data.max_items = settings.cache_size
+        self.clipboard_data.trim()
+
+        # Archiver
+        self.archiver.days = settings.archive_after_days
+        self.archiver.wake_event.set()
+
+        # Thumbnails (render the image cards again with the new size)
+        self.loader.thumbnail_size = settings.thumbnail_size
+        if changed and 'thumbnail_scale' in changed:
+            for item_id, item_type in self.card_types.items():
+                if item_type == 'image':
+                    self.loader.enqueue(item_id)
+
+        # Rendered card limit (the extra cards are dropped by the render pass)
+        if changed and 'max_cards' in changed:
+            self.render_pending()
+        else:
+            self.update_card_floor()
+
+    def report_metrics(self):
+        # Build the memory report
+        cache = self.clipboard_data.stats()
+        report = f'Memory: {get_resident_memory() / 1024 / 1024:.1f} MB - cache: {cache["items"]} items, {cache["resident"] / 1024:.1f} KB of payloads, {cache["hit_rate"]:.0%} hits'
+
+        # Add the monitor metrics
+        metrics = self.monitor.metrics()
+        report += f'\nMonitor: {metrics["wakeups_per_minute"]} wakeups/min, latency: {metrics["average_latency"]:.2f} s'
+
+        # Show the report in the tray icon tooltip (not on stdout, the service keeps all the output of the frontend in memory)
+        self.tray_icon.setToolTip(f'ClipIT service\n{report}')
+
+    def toggle_profiling(self):
+        # Start a session, profiling the GUI thread here and the monitor from its own thread
+        if self.profiling is None:
+            self.profiling = ProfilingSession()
+            self.profiling.attach('GUI')
+            self.monitor.profiling = self.profiling
+            self.monitor.wake()
+            self.profiling_action.setText('Stop profiling')
+            print('Profiling started')
+            return
+
+        # Stop the session and write the report
+        session, self.profiling = self.profiling, None
+        session.detach('GUI')
+        self.monitor.profiling = None
+        self.monitor.wake()
+        path = session.stop()
+        self.profiling_action.setText('Start profiling')
+        print(f'Profiling report written to {path}')
+        self.tray_icon.showMessage('ClipIT', f'Profiling report written to {path}')
+
+    def show_older(self):
+        # Fetch the next page of archived items
+        item_ids = self.database.fetch_page_ids(type=self.type_filter, before_id=self.oldest_archived, limit=ARCHIVE_PAGE_SIZE, archived=True)
+        if not item_ids:
+            self.tray_icon.showMessage('ClipIT', 'No older items')
+            return
+
+        # Make room for the page and let the loader prepare it
+        self.oldest_archived = item_ids[-1]
+        self.older_cards += len(item_ids)
+        self.update_card_floor()
+        for item_id in item_ids:
+            self.loader.enqueue(item_id)
 
     def purge_clipboard(self):
-        # Delete all the items from the database
-        for item in self.clipboard_data.values():
-            self.monitor.delete_queue.append(item)
+        # Delete all the items from the database (live and archived)
+        self.database.purge()
+
+        # The monitor only reports the live items, forget the archived ones here
+        self.archived_changed({item_type: -count for item_type, count in self.archived_counts.items()})
 
         # Delete all the items from the clipboard layout
-        for i in range(self.clipboardLayout.count()):
-            self.clipboardLayout.itemAt(i).widget().deleteLater()
+        self.older_cards = 0
+        self.oldest_archived = None
+        self.page_before = None
+        self.clear_cards()
+
+    def clear_cards(self):
+        # Drop the items that are not rendered yet
+        self.pending_cards = []
+
+        # Delete all the cards from the clipboard layout
+        for frame in self.cards.values():
+            self.clipboardLayout.removeWidget(frame)
+            frame.deleteLater()
+        self.cards.clear()
+        self.card_types.clear()
+        self.card_ids.clear()
+        self.update_card_floor()
 
     def push_clipboard(self, item_id, frame):
-        # Get the item from the clipboard data
-        item = self.clipboard_data[item_id]
+        # Get the item from the clipboard data (reloads the payload if needed)
+        item = self.clipboard_data.get(item_id)
+
+        # Drop the card if the item has been deleted meanwhile
+        if item is None:
+            self.remove_card(item_id)
+            return
 
         # Copy the item data to the clipboard
         if item.type == 'image':
@@ -740,36 +1893,50 @@ class ApplicationWindow(QtWidgets.QMainWindow):
                 copy_image_linux(item.file_path)
             
         else:
-            pyperclip.copy(item.data)
+            pyperclip.copy(self.clipboard_data.payload(item))
 
         # send paste shortcut to the system after a delay
         Thread(target=send_paste).start()
 
-        # Delete the item from the database
-        self.database.delete(item)
+        # Delete the item from the database (the monitor only reports the live items)
+        if self.database.delete(item):
+            self.archived_changed({item.type: -1})
         self.hibernate()
 
         # wait a bit to let the clipboard update
         time.sleep(0.2)
 
         # Delete the item from the clipboard layout
-        self.clipboardLayout.removeWidget(frame)
+        self.remove_card(item_id, frame)
+        del item
+
+    # Remove the card of an item from the window (and the item from the clipboard data)
+    def remove_card(self, item_id, frame=None):
+        frame = self.cards.pop(item_id, frame)
+        if frame is not None:
+            self.clipboardLayout.removeWidget(frame)
+            frame.deleteLater()
 
         # Delete some objects to free memory
-        del self.clipboard_data[item_id]
-        frame.deleteLater()
-        del item
+        self.clipboard_data.remove(item_id)
+        self.card_types.pop(item_id, None)
+        if item_id in self.card_ids:
+            self.card_ids.remove(item_id)
+            self.update_card_floor()
 
         # Update all the UI
         self.update()
 
     def closeEvent(self, event):
-        self.monitor.running = False
+        self.monitor.stop()
         self.monitor.join()
+        self.loader.stop()
+        self.loader.join()
+        self.archiver.stop()
+        self.archiver.join()
         self.database.close()
         event.accept()
 
-    # If win + v is pressed, show the window
     def hibernate(self):
         # Hide the window
         self.hide()
@@ -777,18 +1944,28 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         # Set the sleeping state to true
         self.sleeping = True
 
-        # Wait for a signal to wake up
-        while self.sleeping:
-            time.sleep(0.1)
+        # Let the monitor back off while the window is hidden
+        self.monitor.set_active(False)
+
+    # If ctrl + alt + v is pressed, show the window (called from the hotkey thread)
+    def wake_up(self):
+        print('Waking up')
+
+        # Poll right away so the latest copies are shown
+        self.monitor.wake()
+        self.communicate.wake_up.emit()
+
+    @QtCore.Slot()
+    def show_window(self):
+        self.sleeping = False
+
+        # Poll fast while the window is shown
+        self.monitor.set_active(True)
 
         # Show the window
         self.show()
         self.activateWindow()
 
-    def wake_up(self):
-        self.sleeping = False
-        print('Waking up')
-
     def exit(self):
         self.tray_icon.hide()
         print('Tray icon terminated')
@@ -798,6 +1975,39 @@ class ApplicationWindow(QtWidgets.QMainWindow):
         print('Application terminated')
         sys.exit()
 
+# Get the resident memory (in bytes) of the process
+def get_resident_memory() -> int:
+    if sys.platform == 'win32':
+        # Structure filled by GetProcessMemoryInfo
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', ctypes.c_ulong),
+                ('PageFaultCount', ctypes.c_ulong),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize
+
+    elif sys.platform.startswith('linux'):
+        # The second field of statm is the resident set size (in pages)
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+    else:
+        # Fallback on the peak resident size (in bytes on MacOS)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
 def send_paste():
     time.sleep(0.2)
     print('Pasting')
@@ -805,33 +2015,49 @@ def send_paste():
     print('Pasted')
 
 
-# Stretch a QPixmap to fit a QSize from the center while keeping the aspect ratio
-def get_centered_scaled_pixmap(image_path, size):
+# Normalize a color for the stylesheets (remove the alpha channel)
+def normalize_color(color: str) -> str:
+    # If the color is in the format #RRGGBBAA, remove the alpha channel
+    if color.startswith('#') and len(color) == 9:
+        return color[:7]
+
+    # Else, if there is  4 values (3 ','), remove the alpha channel
+    if color.count(',') == 3:
+        return color[:color.rfind(',')] + ')'
+
+    return color
+
+# Stretch a QImage to fit a QSize from the center while keeping the aspect ratio (safe outside of the GUI thread)
+def get_centered_scaled_image(image_path, size, radius=0):
     # Charger l'image
     image = QtGui.QImage()
     image.load(image_path)
 
-    print(image_path)
-
-    # Créer un QPixmap à partir de l'image
-    pixmap = QtGui.QPixmap.fromImage(image)
-
     # Redimensionner l'image pour qu'elle remplisse le QFrame tout en gardant les proportions
-    scaled_pixmap = pixmap.scaled(size, QtCore.Qt.KeepAspectRatioByExpanding, QtCore.Qt.SmoothTransformation)
+    scaled_image = image.scaled(size, QtCore.Qt.KeepAspectRatioByExpanding, QtCore.Qt.SmoothTransformation)
 
     # Créer une image de destination vide (pleinement remplie de transparence)
-    result_image = QtGui.QImage(size, QtGui.QImage.Format_ARGB32)
+    result_image = QtGui.QImage(size, QtGui.QImage.Format_ARGB32_Premultiplied)
     result_image.fill(QtCore.Qt.transparent)
 
-    # Créer un QPainter pour dessiner l'image redimensionnée au centre
+    # Créer un QPainter pour dessiner l'image redimensionnée au centre (avec des coins arrondis si demandé)
     painter = QtGui.QPainter(result_image)
-    x_offset = (size.width() - scaled_pixmap.width()) // 2
-    y_offset = (size.height() - scaled_pixmap.height()) // 2
-    painter.drawPixmap(x_offset, y_offset, scaled_pixmap)
+    painter.setRenderHint(QtGui.QPainter.Antialiasing)
+    if radius:
+        path = QtGui.QPainterPath()
+        path.addRoundedRect(QtCore.QRectF(result_image.rect()), radius, radius)
+        painter.setClipPath(path)
+    x_offset = (size.width() - scaled_image.width()) // 2
+    y_offset = (size.height() - scaled_image.height()) // 2
+    painter.drawImage(x_offset, y_offset, scaled_image)
     painter.end()
 
+    return result_image
+
+# Stretch a QPixmap to fit a QSize from the center while keeping the aspect ratio
+def get_centered_scaled_pixmap(image_path, size):
     # Retourner un QPixmap basé sur l'image finale centrée
-    return QtGui.QPixmap.fromImage(result_image)
+    return QtGui.QPixmap.fromImage(get_centered_scaled_image(image_path, size))
 
 def copy_image_windows(img_path):
     os.system(f"{BASE_DIR /'nircmd.exe'} clipboard copyimage {img_path}")
@@ -845,5 +2071,5 @@ def copy_image_linux(img_path):
 if __name__ == '__main__':
     # Create the application
     app = QtWidgets.QApplication(sys.argv)
-    main_window = ApplicationWindow(Database(PATH / 'clipboard.db'))
+    main_window = ApplicationWindow(Database(PATH / 'clipboard.db'), Settings(PATH / 'settings.json'))
     sys.exit(app.exec())